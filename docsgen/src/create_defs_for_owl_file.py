@@ -23,14 +23,18 @@ Usage:
 
 import sys
 import re
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from pathlib import Path
 from datetime import date
 
 from rdflib import Graph, RDF, RDFS, OWL, URIRef, Literal
 from rdflib.namespace import SKOS, split_uri, XSD
+from rdflib.util import guess_format
 import argparse
 from datetime import datetime
-from owlrl import DeductiveClosure, OWLRL_Semantics
+from owlrl import DeductiveClosure, OWLRL_Semantics, RDFS_Semantics
 
 # --------------------
 # Settings
@@ -38,19 +42,205 @@ from owlrl import DeductiveClosure, OWLRL_Semantics
 OVERWRITE_EXISTING_AUTOGEN = False  # True -> replace existing ⟦AUTOGEN:*⟧ definitions
 
 # Autogen markers (U+27E6/27E7 are the corner brackets ⟦ ⟧)
-P1_TOKEN_RE = re.compile(r"\u27E6AUTOGEN:P1:\d{4}-\d{2}-\d{2}\u27E7")
-P2_TOKEN_RE = re.compile(r"\u27E6AUTOGEN:P2:\d{4}-\d{2}-\d{2}\u27E7")
-LEGACY_MARKER_RE = re.compile(r"Auto generated comment\s+\d{4}-\d{2}-\d{2}\s*$", re.IGNORECASE)
+# One alternation: ⟦AUTOGEN:P1:date⟧, ⟦AUTOGEN:P2:date⟧, or a trailing legacy "Auto generated comment date"
+AUTOGEN_ANY_RE = re.compile(
+    r"\u27E6AUTOGEN:P[12]:\d{4}-\d{2}-\d{2}\u27E7"
+    r"|(?i:Auto generated comment\s+\d{4}-\d{2}-\d{2}\s*$)"
+)
+
+# Cardinality predicates and their wording, in the order restrictions are checked
+QUALIFIED_CARDINALITY_WORDS = (
+    (OWL.qualifiedCardinality, "exactly"),
+    (OWL.minQualifiedCardinality, "at least"),
+    (OWL.maxQualifiedCardinality, "at most"),
+)
+CARDINALITY_WORDS = (
+    (OWL.cardinality, "exactly"),
+    (OWL.minCardinality, "at least"),
+    (OWL.maxCardinality, "at most"),
+)
+
+# XSD constraining facets and their wording in datatype restrictions
+XSD_FACET_FORMATS = {
+    XSD.minInclusive: "≥ {}",
+    XSD.maxInclusive: "≤ {}",
+    XSD.minExclusive: "> {}",
+    XSD.maxExclusive: "< {}",
+    XSD.pattern: "matching pattern {}",
+    XSD.length: "with length = {}",
+    XSD.minLength: "with length ≥ {}",
+    XSD.maxLength: "with length ≤ {}",
+}
+XSD_NS = str(XSD)
+
+# Initial letters that take "an"; "x" is there for QNames, e.g. "an xsd:decimal value"
+AN_INITIALS = frozenset("aeioux")
+
+# Object-property characteristics and their explanations, in Protégé order
+CHARACTERISTIC_SENTENCES = (
+    (OWL.FunctionalProperty,
+     "It is functional which means that each subject can relate to at most one object by this property."),
+    (OWL.InverseFunctionalProperty,
+     "It is inverse functional which means that each object can be related to by at most one subject via this property."),
+    (OWL.TransitiveProperty,
+     "It is transitive which means that if x relates to y and y relates to z, then x relates to z."),
+    (OWL.SymmetricProperty,
+     "It is symmetric which means that if x relates to y, then y relates to x."),
+    (OWL.AsymmetricProperty,
+     "It is asymmetric which means that if x relates to y, then y cannot relate to x by this property."),
+    (OWL.ReflexiveProperty,
+     "It is reflexive which means that every individual relates to itself by this property."),
+    (OWL.IrreflexiveProperty,
+     "It is irreflexive which means that no individual relates to itself by this property."),
+)
+
+
+# --------------------
+# Read-side indexes
+# --------------------
+# Lookup tables built with one bulk scan per graph, instead of one store probe per term.
+# Tables are only kept inside a graph_indexes() block (document_graph and the generators open one);
+# outside it every call builds them afresh, so the public helpers always see the graph as it is now.
+# Keyed by id(g): Graph equality compares identifiers, and two graphs may share one.
+_GRAPH_INDEXES = {}
+
+
+@contextmanager
+def graph_indexes(*graphs: Graph):
+    """
+    Keep lookup tables for `graphs` until the block exits (nested blocks share them).
+    Wrap loops over the helpers below in one to build each table once; don't edit the
+    graphs inside the block other than through the generators.
+    """
+    opened = [g for g in graphs if id(g) not in _GRAPH_INDEXES]
+    for g in opened:
+        _GRAPH_INDEXES[id(g)] = (len(g), {})
+    try:
+        yield
+    finally:
+        for g in opened:
+            del _GRAPH_INDEXES[id(g)]
+
+
+def _graph_index(g: Graph, name: str, build):
+    """Return the lookup table `name` for g, built with build(g); reused only inside graph_indexes(g)."""
+    entry = _GRAPH_INDEXES.get(id(g))
+    if entry is None:
+        return build(g)
+    size = len(g)
+    if entry[0] != size:  # triples added or removed within the block
+        entry = _GRAPH_INDEXES[id(g)] = (size, {})
+    tables = entry[1]
+    if name not in tables:
+        tables[name] = build(g)
+    return tables[name]
+
+
+def _indexed(generator):
+    """Run a generator inside graph_indexes() for its read graph."""
+    @wraps(generator)
+    def run(g_read: Graph, g_write: Graph, *args, **kwargs):
+        with graph_indexes(g_read):
+            return generator(g_read, g_write, *args, **kwargs)
+    return run
+
+
+def _build_label_map(g: Graph) -> dict:
+    """First literal rdfs:label per subject, in the order label_for's direct lookup sees them."""
+    # subject_objects() walks the store's index by object value, so with several labels per
+    # subject it need not yield the first one; per-subject objects() keeps that order.
+    labels = {}
+    for s in g.subjects(RDFS.label, unique=True):
+        for lab in g.objects(s, RDFS.label):
+            if isinstance(lab, Literal):
+                labels[s] = str(lab)
+                break
+    return labels
+
+
+def _build_objects_map(pred: URIRef):
+    """Builder for a subject -> [objects] table over a single predicate."""
+    def build(g: Graph) -> dict:
+        objs = defaultdict(list)
+        for s, o in g.subject_objects(pred):
+            objs[s].append(o)
+        return objs
+    return build
+
+
+def _build_subjects_map(pred: URIRef):
+    """Builder for an object -> [subjects] table over a single predicate."""
+    def build(g: Graph) -> dict:
+        subjs = defaultdict(list)
+        for s, o in g.subject_objects(pred):
+            subjs[o].append(s)
+        return subjs
+    return build
+
+
+def _build_named_parents(g: Graph) -> dict:
+    """subject -> [named (URIRef) rdfs:subClassOf objects]; the adjacency walked for subsumption tests."""
+    parents = defaultdict(list)
+    for s, o in g.subject_objects(RDFS.subClassOf):
+        if isinstance(o, URIRef):
+            parents[s].append(o)
+    return parents
+
+
+def _build_property_links(g: Graph) -> dict:
+    """property -> {named super-properties and equivalent properties (both directions)}."""
+    links = defaultdict(set)
+    for s, o in g.subject_objects(RDFS.subPropertyOf):
+        if isinstance(o, URIRef):
+            links[s].add(o)
+    for s, o in g.subject_objects(OWL.equivalentProperty):
+        if isinstance(o, URIRef):
+            links[s].add(o)
+        if isinstance(s, URIRef):
+            links[o].add(s)
+    return links
+
+
+def _build_type_index(g: Graph) -> dict:
+    """rdf:type object -> set of subjects, from one pass over rdf:type."""
+    types = defaultdict(set)
+    for s, t in g.subject_objects(RDF.type):
+        types[t].add(s)
+    return dict(types)
+
+
+def _typed(g: Graph, rdf_type: URIRef):
+    """Subjects declared `rdf:type rdf_type` in g (read-only set)."""
+    return _graph_index(g, "types", _build_type_index).get(rdf_type, frozenset())
+
+
+def _build_list_cells(g: Graph) -> dict:
+    """rdf:List cell -> (rdf:first, rdf:rest), from one pass over each predicate."""
+    firsts, rests = {}, {}
+    for cell, item in g.subject_objects(RDF.first):
+        firsts.setdefault(cell, item)
+    for cell, nxt in g.subject_objects(RDF.rest):
+        rests.setdefault(cell, nxt)
+    return {cell: (firsts.get(cell), rests.get(cell)) for cell in firsts.keys() | rests.keys()}
+
+
+def _node_facets(g: Graph, node) -> dict:
+    """{predicate: first object} for node, from one predicate_objects scan (memoized per graph)."""
+    cache = _graph_index(g, "node_facets", lambda _: {})
+    facets = cache.get(node)
+    if facets is None:
+        facets = cache[node] = {}
+        for pred, obj in g.predicate_objects(node):
+            facets.setdefault(pred, obj)
+    return facets
 
 
 # --------------------
 # Helpers
 # --------------------
-def label_for(g: Graph, uri: URIRef) -> str:
-    """Prefer rdfs:label; otherwise use local name. Replace underscores with spaces."""
-    for _, _, lab in g.triples((uri, RDFS.label, None)):
-        if isinstance(lab, Literal):
-            return str(lab)
+@lru_cache(maxsize=None)
+def _local_label(uri: URIRef) -> str:
+    """Local name of uri with underscores replaced by spaces (memoized; depends only on the IRI)."""
     try:
         _, local = split_uri(uri)
     except Exception:
@@ -60,8 +250,27 @@ def label_for(g: Graph, uri: URIRef) -> str:
     return local.replace('_', ' ')
 
 
+def label_for(g: Graph, uri: URIRef) -> str:
+    """Prefer rdfs:label; otherwise use local name. Replace underscores with spaces."""
+    if id(g) in _GRAPH_INDEXES:
+        lab = _graph_index(g, "labels", _build_label_map).get(uri)
+    else:  # a single lookup is cheaper than building the whole table
+        lab = next((str(o) for o in g.objects(uri, RDFS.label) if isinstance(o, Literal)), None)
+    if lab is not None:
+        return lab
+    return _local_label(uri)
+
+
 def qname_or_str(g: Graph, uri: URIRef) -> str:
     """Return a compact QName if possible (e.g., xsd:decimal); else fallback to local name."""
+    cache = _graph_index(g, "qnames", lambda _: {})
+    q = cache.get(uri)
+    if q is None:
+        q = cache[uri] = _qname_or_str(g, uri)
+    return q
+
+
+def _qname_or_str(g: Graph, uri: URIRef) -> str:
     try:
         q = g.namespace_manager.normalizeUri(uri)  # may return QName or full IRI
         if ':' in q and not q.startswith('http'):
@@ -92,62 +301,71 @@ def minimal_named_parents(g: Graph, cls: URIRef):
     excluding OWL.Thing, OWL.Nothing, and reflexive cls ⊑ cls.
     A parent P is kept only if there is no other parent Q (Q != P) such that P ⊑* Q.
     """
+    named_parents = _graph_index(g, "named_parents", _build_named_parents)
+
     # candidate parents: named superclasses only
-    parents = [
-        p for p in g.objects(cls, RDFS.subClassOf)
-        if isinstance(p, URIRef) and p not in (OWL.Thing, OWL.Nothing, cls)
-    ]
-    if not parents:
-        return []
-
-    def is_subclass_of(a: URIRef, b: URIRef) -> bool:
-        """True iff a ⊑* b in g (reflexive-transitive)."""
-        if a == b:
-            return True
-        seen = set([a])
-        stack = [a]
-        while stack:
-            cur = stack.pop()
-            for sup in g.objects(cur, RDFS.subClassOf):
-                if not isinstance(sup, URIRef):
-                    continue
-                if sup == b:
-                    return True
-                if sup not in seen:
-                    seen.add(sup)
-                    stack.append(sup)
-        return False
+    excluded = (OWL.Thing, OWL.Nothing, cls)
+    parents = [p for p in named_parents.get(cls, ()) if p not in excluded]
+    if len(parents) <= 1:
+        return parents  # nothing to compare against
 
     # keep only minimal parents
     minimal = []
     for p in parents:
-        if any(q != p and is_subclass_of(p, q) for q in parents):
+        # A direct rdfs:subClassOf edge answers most cases (the reasoned graph is transitively
+        # closed); the ancestor walk is only needed when no other parent is a direct super of p.
+        direct = named_parents.get(p, ())
+        if any(q != p and (q in direct or q in _named_ancestors(g, p)) for q in parents):
             continue  # p is redundant (it’s below another parent)
         minimal.append(p)
     return minimal
 
 
+def _named_ancestors(g: Graph, cls: URIRef) -> frozenset:
+    """Named classes reachable from cls by one or more rdfs:subClassOf hops (memoized per graph)."""
+    cache = _graph_index(g, "named_ancestors", lambda _: {})
+    ancestors = cache.get(cls)
+    if ancestors is None:
+        named_parents = _graph_index(g, "named_parents", _build_named_parents)
+        seen = set()
+        stack = [cls]
+        while stack:
+            for sup in named_parents.get(stack.pop(), ()):
+                if sup not in seen:
+                    seen.add(sup)
+                    stack.append(sup)
+        ancestors = cache[cls] = frozenset(seen)
+    return ancestors
 
-def has_autogen_def(g: Graph, subject: URIRef) -> bool:
-    """True if subject already has a skos:definition with an AUTOGEN token (P1 or P2) or legacy marker."""
-    for _, _, val in g.triples((subject, SKOS.definition, None)):
-        if isinstance(val, Literal):
-            txt = str(val)
-            if P1_TOKEN_RE.search(txt) or P2_TOKEN_RE.search(txt) or LEGACY_MARKER_RE.search(txt):
-                return True
-    return False
 
+def has_autogen_marker(txt: str) -> bool:
+    """True if txt carries an AUTOGEN token (P1 or P2) or the legacy marker."""
+    # Plain substring tests first: most literals are hand-written and match neither alternative
+    if "\u27E6AUTOGEN:P" not in txt and "generated comment" not in txt.lower():
+        return False
+    return AUTOGEN_ANY_RE.search(txt) is not None
 
-def remove_autogen_defs(g: Graph, subject: URIRef):
-    """Remove existing AUTOGEN skos:definition(s) for subject."""
+
+def autogen_subjects(g: Graph, pred: URIRef = SKOS.definition) -> set:
+    """Subjects whose `pred` values include a literal with an AUTOGEN token (P1 or P2) or legacy marker."""
+    found = set()
+    for subj, _, val in g.triples((None, pred, None)):
+        if isinstance(val, Literal) and subj not in found:
+            if has_autogen_marker(str(val)):
+                found.add(subj)
+    return found
+
+
+def remove_autogen_defs(g: Graph, subject: URIRef, pred: URIRef = SKOS.definition) -> bool:
+    """Remove existing AUTOGEN `pred` literal(s) (skos:definition by default) for subject; True if any were removed."""
     to_remove = []
-    for _, p, val in g.triples((subject, SKOS.definition, None)):
+    for _, p, val in g.triples((subject, pred, None)):
         if isinstance(val, Literal):
-            txt = str(val)
-            if P1_TOKEN_RE.search(txt) or P2_TOKEN_RE.search(txt) or LEGACY_MARKER_RE.search(txt):
+            if has_autogen_marker(str(val)):
                 to_remove.append((subject, p, val))
     for t in to_remove:
         g.remove(t)
+    return bool(to_remove)
 
 
 def join_or(items):
@@ -160,81 +378,68 @@ def join_or(items):
 
 
 def sentences_unique_preserve_order(sentences):
-    seen = set()
-    out = []
-    for s in sentences:
-        if s not in seen:
-            out.append(s)
-            seen.add(s)
-    return out
-
-
-def super_properties_transitive(g: Graph, p: URIRef):
-    """All super-properties of p via transitive rdfs:subPropertyOf (including direct ones)."""
-    visited, stack = set(), [p]
-    supers = set()
-    while stack:
-        cur = stack.pop()
-        if cur in visited:
-            continue
-        visited.add(cur)
-        for sup in g.objects(cur, RDFS.subPropertyOf):
-            if isinstance(sup, URIRef):
-                supers.add(sup)
-                stack.append(sup)
-    return supers
-
-
-def eq_properties(g: Graph, p: URIRef):
-    eq = set(g.objects(p, OWL.equivalentProperty)) | set(g.subjects(OWL.equivalentProperty, p))
-    return {q for q in eq if isinstance(q, URIRef)}
+    return list(dict.fromkeys(sentences))  # dicts keep first-insertion order
 
 
 def property_frontier(g: Graph, p: URIRef):
     """
-    Fixed-point closure over: {p} ∪ eq(p) ∪ super*(p) ∪ eq(super*(p)) ∪ super*(eq(...)) ...
+    Closure over: {p} ∪ eq(p) ∪ super*(p) ∪ eq(super*(p)) ∪ super*(eq(...)) ...
+    One traversal of rdfs:subPropertyOf ∪ owl:equivalentProperty (both directions), memoized per graph.
     """
-    frontier = {p}
-    changed = True
-    while changed:
-        changed = False
-        new = set()
-        for q in list(frontier):
-            new |= super_properties_transitive(g, q)
-            new |= eq_properties(g, q)
-        if not new.issubset(frontier):
-            frontier |= new
-            changed = True
+    cache = _graph_index(g, "property_frontiers", lambda _: {})
+    frontier = cache.get(p)
+    if frontier is None:
+        links = _graph_index(g, "property_links", _build_property_links)
+        reached = {p}
+        stack = [p]
+        while stack:
+            for q in links.get(stack.pop(), ()):
+                if q not in reached:
+                    reached.add(q)
+                    stack.append(q)
+        frontier = cache[p] = frozenset(reached)
     return frontier
 
 
 def effective_domains(g: Graph, p: URIRef):
+    domain_map = _graph_index(g, "domain", _build_objects_map(RDFS.domain))
     doms = set()
     for prop in property_frontier(g, p):
-        doms.update(g.objects(prop, RDFS.domain))
+        doms.update(domain_map.get(prop, ()))
     return list(doms)
 
 
 def effective_ranges(g: Graph, p: URIRef):
+    range_map = _graph_index(g, "range", _build_objects_map(RDFS.range))
     rngs = set()
     for prop in property_frontier(g, p):
-        rngs.update(g.objects(prop, RDFS.range))
+        rngs.update(range_map.get(prop, ()))
     return list(rngs)
 
 
 # ---------- Class Axiom Rendering (technical) ----------
 
 def _render_rdf_list(g: Graph, head: URIRef):
+    cells = _graph_index(g, "list_cells", _build_list_cells)
+    nil = RDF.nil
     members = []
-    while head and head != RDF.nil:
-        first = g.value(head, RDF.first)
+    while head and head != nil:
+        first, head = cells.get(head, (None, None))
         if first is not None:
             members.append(first)
-        head = g.value(head, RDF.rest)
     return members
 
 
 def _render_datatype_range(g: Graph, node) -> str:
+    """Memoized per graph; see _render_datatype_range_uncached."""
+    cache = _graph_index(g, "datatype_ranges", lambda _: {})
+    text = cache.get(node)
+    if text is None:
+        text = cache[node] = _render_datatype_range_uncached(g, node)
+    return text
+
+
+def _render_datatype_range_uncached(g: Graph, node) -> str:
     """
     Render a datatype or a datatype restriction into a compact technical phrase.
     Examples:
@@ -248,48 +453,43 @@ def _render_datatype_range(g: Graph, node) -> str:
         return f"an {qname_or_str(g, node)}"
 
     # Datatype restriction: onDatatype + withRestrictions
-    on_dt = g.value(node, OWL.onDatatype)
+    node_facets = _node_facets(g, node)
+    on_dt = node_facets.get(OWL.onDatatype)
     if on_dt is None:
         return "a literal"
 
     base = f"an {qname_or_str(g, on_dt)}"
     facets = []
 
-    wr_head = g.value(node, OWL.withRestrictions)
+    wr_head = node_facets.get(OWL.withRestrictions)
     if wr_head:
         for bn in _render_rdf_list(g, wr_head):
             for pred, val in g.predicate_objects(bn):
-                if not isinstance(pred, URIRef):
-                    continue
                 # Recognize common XSD facets
-                if pred == XSD.minInclusive:
-                    facets.append(f"≥ {val}")
-                elif pred == XSD.maxInclusive:
-                    facets.append(f"≤ {val}")
-                elif pred == XSD.minExclusive:
-                    facets.append(f"> {val}")
-                elif pred == XSD.maxExclusive:
-                    facets.append(f"< {val}")
-                elif pred == XSD.pattern:
-                    facets.append(f"matching pattern {val}")
-                elif pred == XSD.length:
-                    facets.append(f"with length = {val}")
-                elif pred == XSD.minLength:
-                    facets.append(f"with length ≥ {val}")
-                elif pred == XSD.maxLength:
-                    facets.append(f"with length ≤ {val}")
+                fmt = XSD_FACET_FORMATS.get(pred)
+                if fmt is not None:
+                    facets.append(fmt.format(val))
 
     return f"{base} {' and '.join(facets)}" if facets else base
 
 
 def _is_data_range(g: Graph, node) -> bool:
     """True if node looks like a datatype or a datatype restriction."""
-    if isinstance(node, URIRef) and str(node).startswith(str(XSD)):
+    if isinstance(node, URIRef) and node.startswith(XSD_NS):
         return True
-    return g.value(node, OWL.onDatatype) is not None
+    return OWL.onDatatype in _node_facets(g, node)
 
 
 def _render_class_expr_technical(g: Graph, expr: URIRef) -> str:
+    """Memoized per graph (shared restriction/union nodes are rendered once); see _render_class_expr_technical_uncached."""
+    cache = _graph_index(g, "class_exprs", lambda _: {})
+    text = cache.get(expr)
+    if text is None:
+        text = cache[expr] = _render_class_expr_technical_uncached(g, expr)
+    return text
+
+
+def _render_class_expr_technical_uncached(g: Graph, expr: URIRef) -> str:
     """
     Deterministic, technical rendering for a subset of class expressions:
       - Named class -> its label
@@ -310,15 +510,17 @@ def _render_class_expr_technical(g: Graph, expr: URIRef) -> str:
         mid = ", ".join(parts[:-1])
         return f"either {mid}, or {parts[-1]}"
 
+    facets = _node_facets(g, expr)
+
     # unionOf
-    union = g.value(expr, OWL.unionOf)
+    union = facets.get(OWL.unionOf)
     if union:
         items = [_render_class_expr_technical(g, m) for m in _render_rdf_list(g, union)]
         items = [i for i in items if i]
         return _either_join(items)
 
     # intersectionOf
-    inter = g.value(expr, OWL.intersectionOf)
+    inter = facets.get(OWL.intersectionOf)
     if inter:
         parts = [_render_class_expr_technical(g, m) for m in _render_rdf_list(g, inter)]
         parts = [p for p in parts if p]
@@ -330,7 +532,7 @@ def _render_class_expr_technical(g: Graph, expr: URIRef) -> str:
         return f"all of {mid}, and {parts[-1]}"
 
     # oneOf (enumeration of individuals)
-    oneof = g.value(expr, OWL.oneOf)
+    oneof = facets.get(OWL.oneOf)
     if oneof:
         labels = []
         for m in _render_rdf_list(g, oneof):
@@ -343,26 +545,17 @@ def _render_class_expr_technical(g: Graph, expr: URIRef) -> str:
         return _either_join(labels)
 
     # Restriction (unchanged from your version)
-    if (expr, RDF.type, OWL.Restriction) in g:
-        p = g.value(expr, OWL.onProperty)
+    if expr in _typed(g, OWL.Restriction):
+        p = facets.get(OWL.onProperty)
         p_label = label_for(g, p) if isinstance(p, URIRef) else "<?>"
 
-        # Qualified cardinalities
-        qcard = g.value(expr, OWL.qualifiedCardinality)
-        qmin  = g.value(expr, OWL.minQualifiedCardinality)
-        qmax  = g.value(expr, OWL.maxQualifiedCardinality)
-        qcls  = g.value(expr, OWL.onClass)
-        qdr   = g.value(expr, OWL.onDataRange)
-
-        # Unqualified cardinalities
-        ucard = g.value(expr, OWL.cardinality)
-        umin  = g.value(expr, OWL.minCardinality)
-        umax  = g.value(expr, OWL.maxCardinality)
+        qcls  = facets.get(OWL.onClass)
+        qdr   = facets.get(OWL.onDataRange)
 
-        some  = g.value(expr, OWL.someValuesFrom)
-        allv  = g.value(expr, OWL.allValuesFrom)
-        hasv  = g.value(expr, OWL.hasValue)
-        hasself = (expr, OWL.hasSelf, Literal(True)) in g
+        some  = facets.get(OWL.someValuesFrom)
+        allv  = facets.get(OWL.allValuesFrom)
+        hasv  = facets.get(OWL.hasValue)
+        hasself = facets.get(OWL.hasSelf) == Literal(True)
 
         def cls_txt(c):
             return label_for(g, c) if isinstance(c, URIRef) else "Thing"
@@ -374,34 +567,29 @@ def _render_class_expr_technical(g: Graph, expr: URIRef) -> str:
         if hasself:
             return f"is related to itself by ‘{p_label}’"
 
-        if qcard is not None and qcls is not None:
-            n = int(str(qcard));  return f"has exactly {n} ‘{p_label}’ to {cls_txt(qcls)}"
-        if qmin  is not None and qcls is not None:
-            n = int(str(qmin));   return f"has at least {n} ‘{p_label}’ to {cls_txt(qcls)}"
-        if qmax  is not None and qcls is not None:
-            n = int(str(qmax));   return f"has at most {n} ‘{p_label}’ to {cls_txt(qcls)}"
-
-        if qcard is not None and qdr is not None:
-            n = int(str(qcard));  return f"has exactly {n} ‘{p_label}’ values that are {_render_datatype_range(g, qdr)}"
-        if qmin  is not None and qdr is not None:
-            n = int(str(qmin));   return f"has at least {n} ‘{p_label}’ values that are {_render_datatype_range(g, qdr)}"
-        if qmax  is not None and qdr is not None:
-            n = int(str(qmax));   return f"has at most {n} ‘{p_label}’ values that are {_render_datatype_range(g, qdr)}"
-
-        if ucard is not None:
-            n = int(str(ucard));  return f"has exactly {n} ‘{p_label}’"
-        if umin  is not None:
-            n = int(str(umin));   return f"has at least {n} ‘{p_label}’"
-        if umax  is not None:
-            n = int(str(umax));   return f"has at most {n} ‘{p_label}’"
+        # Qualified cardinalities (onClass before onDataRange), then unqualified ones
+        if qcls is not None:
+            for pred, word in QUALIFIED_CARDINALITY_WORDS:
+                n = facets.get(pred)
+                if n is not None:
+                    return f"has {word} {int(str(n))} ‘{p_label}’ to {cls_txt(qcls)}"
+        if qdr is not None:
+            for pred, word in QUALIFIED_CARDINALITY_WORDS:
+                n = facets.get(pred)
+                if n is not None:
+                    return f"has {word} {int(str(n))} ‘{p_label}’ values that are {_render_datatype_range(g, qdr)}"
+        for pred, word in CARDINALITY_WORDS:
+            n = facets.get(pred)
+            if n is not None:
+                return f"has {word} {int(str(n))} ‘{p_label}’"
 
         if some is not None:
-            if _is_data_range(g, some) or (isinstance(p, URIRef) and (p, RDF.type, OWL.DatatypeProperty) in g):
+            if _is_data_range(g, some) or (isinstance(p, URIRef) and p in _typed(g, OWL.DatatypeProperty)):
                 return f"has at least one ‘{p_label}’ value that is {_render_datatype_range(g, some)}"
             return f"has at least one ‘{p_label}’ to {cls_txt(some)}"
 
         if allv is not None:
-            if _is_data_range(g, allv) or (isinstance(p, URIRef) and (p, RDF.type, OWL.DatatypeProperty) in g):
+            if _is_data_range(g, allv) or (isinstance(p, URIRef) and p in _typed(g, OWL.DatatypeProperty)):
                 return f"only has ‘{p_label}’ values that are {_render_datatype_range(g, allv)}"
             return f"only has ‘{p_label}’ to {cls_txt(allv)}"
 
@@ -429,39 +617,48 @@ def _render_equiv_or_sub_sentence(g: Graph, cls: URIRef, expr: URIRef, relation:
 # Generators (READ from g_read; WRITE to g_write)
 # --------------------
 
+@_indexed
 def add_class_definitions(g_read: Graph, g_write: Graph, today_iso: str):
     """Generate autogen skos:definition for classes, using minimal named parents from the reasoned graph."""
-    classes = set(s for s in g_read.subjects(RDF.type, OWL.Class) if isinstance(s, URIRef))
-    classes.update(s for s, _, _ in g_read.triples((None, RDFS.subClassOf, None)) if isinstance(s, URIRef))
+    sup_map = _graph_index(g_read, "subClassOf", _build_objects_map(RDFS.subClassOf))
+    classes = {s for s in _typed(g_read, OWL.Class).union(sup_map) if isinstance(s, URIRef)}
     classes.discard(OWL.Thing)
     classes.discard(OWL.Nothing)
 
     added = updated = 0
-    for cls in sorted(classes, key=lambda u: str(u)):
+    new_quads = []  # added in one addN() call after the loop
+    definition = SKOS.definition  # namespace attribute lookups build a new URIRef each time
+    # One scan of g_write instead of a lookup per class (overwrite mode detects by removing instead)
+    autogen = set() if OVERWRITE_EXISTING_AUTOGEN else autogen_subjects(g_write)
+    token = f"⟦AUTOGEN:P1:{today_iso}⟧"
+    for cls in sorted(classes, key=str):
         # Check/update against the graph we will serialize
-        if has_autogen_def(g_write, cls) and not OVERWRITE_EXISTING_AUTOGEN:
-            continue
-        if OVERWRITE_EXISTING_AUTOGEN and has_autogen_def(g_write, cls):
-            remove_autogen_defs(g_write, cls)
+        if OVERWRITE_EXISTING_AUTOGEN and remove_autogen_defs(g_write, cls):
             updated += 1
+        elif cls in autogen:
+            continue
         else:
             added += 1
 
         cls_label = label_for(g_read, cls)
-        parents = minimal_named_parents(g_read, cls)
+        # Label each parent once, then sort by label: store order is not stable between runs.
+        parent_labels = [label_for(g_read, p) for p in minimal_named_parents(g_read, cls)]
+        parent_labels.sort(key=str.lower)
 
-        sentences = [f"A {cls_label} is a kind of {label_for(g_read, p)}." for p in parents]
+        sentences = [f"A {cls_label} is a kind of {lab}." for lab in parent_labels]
         # If no named parents other than Thing were found, emit no parent sentences.
-        text = (" ".join(sentences) + (" " if sentences else "")) + f"⟦AUTOGEN:P1:{today_iso}⟧"
+        text = " ".join([*sentences, token])
 
-        g_write.add((cls, SKOS.definition, Literal(text)))
+        new_quads.append((cls, definition, Literal(text), g_write))
+    g_write.addN(new_quads)
     return added, updated
 
 
 
+@_indexed
 def add_datatype_property_definitions(g_read: Graph, g_write: Graph, today_iso: str):
     """Generate autogen skos:definition for datatype properties (T1 template)."""
-    props = set(s for s in g_read.subjects(RDF.type, OWL.DatatypeProperty) if isinstance(s, URIRef))
+    props = set(s for s in _typed(g_read, OWL.DatatypeProperty) if isinstance(s, URIRef))
 
     # Exclude top/bottom data property if present
     try:
@@ -471,12 +668,15 @@ def add_datatype_property_definitions(g_read: Graph, g_write: Graph, today_iso:
         pass  # rdflib may not expose these in some versions; no harm
 
     added = updated = 0
-    for prop in sorted(props, key=lambda u: str(u)):
-        if has_autogen_def(g_write, prop) and not OVERWRITE_EXISTING_AUTOGEN:
-            continue
-        if OVERWRITE_EXISTING_AUTOGEN and has_autogen_def(g_write, prop):
-            remove_autogen_defs(g_write, prop)
+    new_quads = []  # added in one addN() call after the loop
+    definition = SKOS.definition
+    autogen = set() if OVERWRITE_EXISTING_AUTOGEN else autogen_subjects(g_write)
+    token = f"⟦AUTOGEN:P1:{today_iso}⟧"
+    for prop in sorted(props, key=str):
+        if OVERWRITE_EXISTING_AUTOGEN and remove_autogen_defs(g_write, prop):
             updated += 1
+        elif prop in autogen:
+            continue
         else:
             added += 1
 
@@ -488,7 +688,7 @@ def add_datatype_property_definitions(g_read: Graph, g_write: Graph, today_iso:
 
         if ranges:
             range_text = join_or([qname_or_str(g_read, r) for r in ranges])
-            article = "an" if range_text[:1].lower() in set("aeioux") else "a"
+            article = "an" if range_text[:1].lower() in AN_INITIALS else "a"
             rng_phrase = f"as {article} {range_text} value."
         else:
             rng_phrase = "as a literal value."
@@ -501,14 +701,16 @@ def add_datatype_property_definitions(g_read: Graph, g_write: Graph, today_iso:
         else:
             sentences.append(f"The data property {prop_label} records the {prop_label} {rng_phrase}")
 
-        sentences = sentences_unique_preserve_order([s.strip() if s.endswith('.') else s.strip() for s in sentences])
+        sentences = sentences_unique_preserve_order(s.strip() for s in sentences)
         text_body = " ".join(s if s.endswith('.') else s + '.' for s in sentences)
-        text = f"{text_body} ⟦AUTOGEN:P1:{today_iso}⟧"
+        text = f"{text_body} {token}"
 
-        g_write.add((prop, SKOS.definition, Literal(text)))
+        new_quads.append((prop, definition, Literal(text), g_write))
+    g_write.addN(new_quads)
     return added, updated
 
 
+@_indexed
 def add_class_axiom_scope_notes(g_read: Graph, g_write: Graph, today_iso: str, include_scope_note: bool = True):
     """
     Generate AUTOGEN technical sentences for class axioms into skos:scopeNote.
@@ -517,84 +719,78 @@ def add_class_axiom_scope_notes(g_read: Graph, g_write: Graph, today_iso: str, i
     if not include_scope_note:
         return 0, 0
 
-    def _has_autogen_scope(gw: Graph, s: URIRef) -> bool:
-        for _, _, val in gw.triples((s, SKOS.scopeNote, None)):
-            if isinstance(val, Literal):
-                txt = str(val)
-                if P1_TOKEN_RE.search(txt) or P2_TOKEN_RE.search(txt) or LEGACY_MARKER_RE.search(txt):
-                    return True
-        return False
-
-    def _remove_autogen_scope(gw: Graph, s: URIRef):
-        to_remove = []
-        for _, p, val in gw.triples((s, SKOS.scopeNote, None)):
-            if isinstance(val, Literal):
-                txt = str(val)
-                if P1_TOKEN_RE.search(txt) or P2_TOKEN_RE.search(txt) or LEGACY_MARKER_RE.search(txt):
-                    to_remove.append((s, p, val))
-        for t in to_remove:
-            gw.remove(t)
-
-    classes = set(s for s in g_read.subjects(RDF.type, OWL.Class) if isinstance(s, URIRef))
+    classes = set(s for s in _typed(g_read, OWL.Class) if isinstance(s, URIRef))
     classes.discard(OWL.Thing); classes.discard(OWL.Nothing)
 
+    eq_map = _graph_index(g_read, "equivalentClass", _build_objects_map(OWL.equivalentClass))
+    sup_map = _graph_index(g_read, "subClassOf", _build_objects_map(RDFS.subClassOf))
+    # Classes without any equivalentClass/subClassOf axiom cannot produce a note
+    classes &= eq_map.keys() | sup_map.keys()
+
     added = updated = 0
-    for cls in sorted(classes, key=lambda u: str(u)):
+    new_quads = []  # added in one addN() call after the loop
+    scope_note = SKOS.scopeNote
+    autogen = set() if OVERWRITE_EXISTING_AUTOGEN else autogen_subjects(g_write, scope_note)
+    token = f"⟦AUTOGEN:P1:{today_iso}⟧"
+    top_bottom = (OWL.Nothing, OWL.Thing)
+    for cls in sorted(classes, key=str):
         exprs = []
 
         # owl:equivalentClass (skip reflexive cls ≡ cls)
-        for _, _, e in g_read.triples((cls, OWL.equivalentClass, None)):
+        for e in eq_map.get(cls, ()):
             if e == cls:
                 continue
             exprs.append(("equivalent to", e))
 
         # rdfs:subClassOf (skip Nothing, Thing, and reflexive cls ⊑ cls)
-        for _, _, e in g_read.triples((cls, RDFS.subClassOf, None)):
-            if e in (OWL.Nothing, OWL.Thing, cls):
+        for e in sup_map.get(cls, ()):
+            if e == cls or e in top_bottom:
                 continue
             exprs.append(("a kind of", e))
 
         if not exprs:
             continue
 
-        if _has_autogen_scope(g_write, cls) and not OVERWRITE_EXISTING_AUTOGEN:
+        if OVERWRITE_EXISTING_AUTOGEN and remove_autogen_defs(g_write, cls, scope_note):
+            updated += 1
+        elif cls in autogen:
             continue
-        if OVERWRITE_EXISTING_AUTOGEN and _has_autogen_scope(g_write, cls):
-            _remove_autogen_scope(g_write, cls); updated += 1
         else:
             added += 1
 
         sentences = [_render_equiv_or_sub_sentence(g_read, cls, e, rel) for (rel, e) in exprs]
-        sentences = sentences_unique_preserve_order([s.strip() for s in sentences if s and s.strip()])
+        sentences = sentences_unique_preserve_order(t for t in (s.strip() for s in sentences if s) if t)
         body = " ".join(s if s.endswith('.') else s + '.' for s in sentences)
-        text = f"{body} ⟦AUTOGEN:P1:{today_iso}⟧"
+        text = f"{body} {token}"
 
-        g_write.add((cls, SKOS.scopeNote, Literal(text)))
+        new_quads.append((cls, scope_note, Literal(text), g_write))
 
+    g_write.addN(new_quads)
     return added, updated
 
 
 
+@_indexed
 def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: str):
     """Generate autogen skos:definition for object properties (reads from g_read, writes to g_write)."""
     # Local helpers (kept inside to avoid polluting module namespace)
     def _label_for(u: URIRef) -> str:
         return label_for(g_read, u)
 
-    def _render_list_members(head: URIRef):
-        members = []
-        while head and head != RDF.nil:
-            first = g_read.value(head, RDF.first)
-            if first is not None:
-                members.append(first)
-            head = g_read.value(head, RDF.rest)
-        return members
+    rendered = {}  # class expression -> phrase; the same domains/ranges recur across properties
 
     def _render_class_expr(cls: URIRef) -> str:
+        text = rendered.get(cls)
+        if text is None:
+            text = rendered[cls] = _render_class_expr_uncached(cls)
+        return text
+
+    def _render_class_expr_uncached(cls: URIRef) -> str:
         # unionOf → "either A or B"
-        union_list = g_read.value(cls, OWL.unionOf)
+        facets = _node_facets(g_read, cls)
+        union_list = facets.get(OWL.unionOf)
         if union_list:
-            labels = [_label_for(m) for m in _render_list_members(union_list)]
+            labels = [_label_for(m) for m in _render_rdf_list(g_read, union_list)]
             if len(labels) == 1:
                 return labels[0]
             if len(labels) == 2:
@@ -603,9 +799,9 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
             return f"either {mid}, or {labels[-1]}"
 
         # intersectionOf → "both A and B" / "all of ..."
-        inter_list = g_read.value(cls, OWL.intersectionOf)
+        inter_list = facets.get(OWL.intersectionOf)
         if inter_list:
-            labels = [_label_for(m) for m in _render_list_members(inter_list)]
+            labels = [_label_for(m) for m in _render_rdf_list(g_read, inter_list)]
             if len(labels) == 1:
                 return labels[0]
             if len(labels) == 2:
@@ -643,22 +839,7 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
         return f"a relation between {d_txt} and {r_txt}"
 
     def _property_characteristics(p: URIRef):
-        sents = []
-        if (p, RDF.type, OWL.FunctionalProperty) in g_read:
-            sents.append("It is functional which means that each subject can relate to at most one object by this property.")
-        if (p, RDF.type, OWL.InverseFunctionalProperty) in g_read:
-            sents.append("It is inverse functional which means that each object can be related to by at most one subject via this property.")
-        if (p, RDF.type, OWL.TransitiveProperty) in g_read:
-            sents.append("It is transitive which means that if x relates to y and y relates to z, then x relates to z.")
-        if (p, RDF.type, OWL.SymmetricProperty) in g_read:
-            sents.append("It is symmetric which means that if x relates to y, then y relates to x.")
-        if (p, RDF.type, OWL.AsymmetricProperty) in g_read:
-            sents.append("It is asymmetric which means that if x relates to y, then y cannot relate to x by this property.")
-        if (p, RDF.type, OWL.ReflexiveProperty) in g_read:
-            sents.append("It is reflexive which means that every individual relates to itself by this property.")
-        if (p, RDF.type, OWL.IrreflexiveProperty) in g_read:
-            sents.append("It is irreflexive which means that no individual relates to itself by this property.")
-        return sents
+        return [sent for char, sent in CHARACTERISTIC_SENTENCES if p in _typed(g_read, char)]
 
     def _quote_first_use(name: str, seen: set) -> str:
         if name not in seen:
@@ -667,7 +848,7 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
         return name
 
     # Gather object properties from the REASONED graph
-    props = set(s for s in g_read.subjects(RDF.type, OWL.ObjectProperty) if isinstance(s, URIRef))
+    props = set(s for s in _typed(g_read, OWL.ObjectProperty) if isinstance(s, URIRef))
     # Exclude top/bottom object property if present
     try:
         props.discard(OWL.topObjectProperty)
@@ -676,14 +857,21 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
         pass
 
     added = updated = 0
-
-    for p in sorted(props, key=lambda u: str(u)):
+    new_quads = []  # added in one addN() call after the loop
+    definition = SKOS.definition
+    sup_map = _graph_index(g_read, "subPropertyOf", _build_objects_map(RDFS.subPropertyOf))
+    sub_map = _graph_index(g_read, "subPropertyOf^-1", _build_subjects_map(RDFS.subPropertyOf))
+    inv_map = _graph_index(g_read, "inverseOf", _build_objects_map(OWL.inverseOf))
+    inv_of_map = _graph_index(g_read, "inverseOf^-1", _build_subjects_map(OWL.inverseOf))
+    autogen = set() if OVERWRITE_EXISTING_AUTOGEN else autogen_subjects(g_write)
+    token = f"⟦AUTOGEN:P1:{today_iso}⟧"
+
+    for p in sorted(props, key=str):
         # AUTOGEN overwrite behavior mirrors your other generators (check against WRITE graph)
-        if has_autogen_def(g_write, p) and not OVERWRITE_EXISTING_AUTOGEN:
-            continue
-        if OVERWRITE_EXISTING_AUTOGEN and has_autogen_def(g_write, p):
-            remove_autogen_defs(g_write, p)
+        if OVERWRITE_EXISTING_AUTOGEN and remove_autogen_defs(g_write, p):
             updated += 1
+        elif p in autogen:
+            continue
         else:
             added += 1
 
@@ -696,7 +884,7 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
         parts.append(f"The property {p_label_q} is {_first_sentence_relation(p)}.")
 
         # Super-properties (skip reflexive p ⊑ p)
-        supers = [s for s in g_read.objects(p, RDFS.subPropertyOf) if isinstance(s, URIRef) and s != p]
+        supers = [s for s in sup_map.get(p, ()) if isinstance(s, URIRef) and s != p]
         if supers:
             super_labels_q = [_quote_first_use(_label_for(s), seen_labels) for s in supers]
             if len(super_labels_q) == 1:
@@ -709,7 +897,7 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
                 parts.append(f"This means that if x {p_label} y then x {s_lbl} y.")
 
         # Sub-properties
-        subs = [s for s in g_read.subjects(RDFS.subPropertyOf, p) if isinstance(s, URIRef)]
+        subs = [s for s in sub_map.get(p, ()) if isinstance(s, URIRef)]
         if subs:
             sub_labels_q = [_quote_first_use(_label_for(s), seen_labels) for s in subs]
             if len(sub_labels_q) == 1:
@@ -722,7 +910,7 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
                 parts.append(f"This means that if a subject x {s_lbl} y then x {p_label} y.")
 
         # Inverse (both directions)
-        inverses = set(g_read.objects(p, OWL.inverseOf)) | set(g_read.subjects(OWL.inverseOf, p))
+        inverses = set(inv_map.get(p, ())) | set(inv_of_map.get(p, ()))
         if inverses:
             inv = next(iter(inverses))
             inv_lbl = _label_for(inv)
@@ -733,15 +921,141 @@ def add_object_property_definitions(g_read: Graph, g_write: Graph, today_iso: st
         parts.extend(_property_characteristics(p))
 
         # Compose, uniquify, punctuate, and add AUTOGEN token
-        parts = sentences_unique_preserve_order([s.strip() for s in parts if s and s.strip()])
+        parts = sentences_unique_preserve_order(t for t in (s.strip() for s in parts if s) if t)
         body = " ".join(s if s.endswith('.') else s + '.' for s in parts)
-        text = f"{body} ⟦AUTOGEN:P1:{today_iso}⟧"
+        text = f"{body} {token}"
 
-        g_write.add((p, SKOS.definition, Literal(text)))
+        new_quads.append((p, definition, Literal(text), g_write))
 
+    g_write.addN(new_quads)
     return added, updated
 
 
+# --------------------
+# Pipeline (also usable on an already-loaded graph)
+# --------------------
+def _transitive_pairs(edges: dict):
+    """(x, y) for every y reachable from x by one or more edges (cycle-safe)."""
+    for start in list(edges):
+        seen = set()
+        stack = [start]
+        while stack:
+            for nxt in edges.get(stack.pop(), ()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+                    yield start, nxt
+
+
+def minimal_closure(g: Graph):
+    """
+    Materialize, in place, only the entailments the generators read:
+      equivalentClass/equivalentProperty (symmetric, and as mutual sub-class/sub-property),
+      inverseOf (symmetric), transitive subClassOf and subPropertyOf, and domains/ranges
+      inherited from super-properties and widened to superclasses.
+    intersectionOf (an intersection is a sub-class of each member, so a class defined as one
+      gets its members as parents).
+    A small subset of OWL RL (scm-eqc1, scm-eqp1, scm-sco, scm-spo, scm-dom1/2, scm-rng1/2, scm-int, prp-inv),
+    computed over plain adjacency dicts instead of rule iteration.
+    """
+    sco, spo = defaultdict(set), defaultdict(set)
+    for s, o in g.subject_objects(RDFS.subClassOf):
+        sco[s].add(o)
+    cells = _build_list_cells(g)
+    for expr, head in g.subject_objects(OWL.intersectionOf):
+        seen = set()
+        while head in cells and head not in seen:  # guard against cyclic lists
+            seen.add(head)
+            member, head = cells[head]
+            if member is not None:
+                sco[expr].add(member)
+    for s, o in g.subject_objects(RDFS.subPropertyOf):
+        spo[s].add(o)
+    new = []
+    for pred, sub in ((OWL.equivalentClass, sco), (OWL.equivalentProperty, spo)):
+        for s, o in list(g.subject_objects(pred)):
+            new.append((o, pred, s))
+            sub[s].add(o)
+            sub[o].add(s)
+    for s, o in g.subject_objects(OWL.inverseOf):
+        new.append((o, OWL.inverseOf, s))
+
+    sco_pairs = set(_transitive_pairs(sco))
+    spo_pairs = set(_transitive_pairs(spo))
+    supers = defaultdict(set)
+    for c, d in sco_pairs:
+        supers[c].add(d)
+    new.extend((c, RDFS.subClassOf, d) for c, d in sco_pairs)
+    new.extend((p, RDFS.subPropertyOf, q) for p, q in spo_pairs)
+
+    for pred in (RDFS.domain, RDFS.range):
+        declared = defaultdict(set)
+        for p, c in g.subject_objects(pred):
+            declared[p].add(c)
+            declared[p] |= supers.get(c, set())
+        for p, q in spo_pairs:
+            declared[p] |= declared.get(q, set())
+        new.extend((p, pred, c) for p, cs in declared.items() for c in cs)
+
+    g.addN((s, p, o, g) for s, p, o in new)
+
+
+def _owlrl_closure(semantics):
+    """Builder for an in-place owlrl expansion under `semantics`."""
+    def expand(g: Graph):
+        # Keep axiomatic/datatype entailments out to avoid clutter
+        DeductiveClosure(
+            semantics,
+            axiomatic_triples=False,
+            datatype_axioms=False
+        ).expand(g)
+    return expand
+
+
+# Entailment applied to the read graph, by CLI name: full OWL 2 RL; the cheaper RDFS rule set
+# (sub-class/property, domain/range; no equivalence or property characteristics); the hierarchy
+# closures the generators rely on most (see minimal_closure; no unionOf or restriction
+# subsumption, so some scope notes are shorter than under OWL RL); or none.
+REASONERS = {
+    "owlrl": _owlrl_closure(OWLRL_Semantics),
+    "rdfs": _owlrl_closure(RDFS_Semantics),
+    "minimal": minimal_closure,
+    "none": None,
+}
+
+
+def reasoned_copy(g_base: Graph, reasoner: str = "owlrl") -> Graph:
+    """Return the closure of g_base under `reasoner` (see REASONERS) as a separate graph (g_base is left untouched)."""
+    expand = REASONERS[reasoner]
+    g_reason = Graph()
+    g_reason += g_base
+    if expand is not None:
+        expand(g_reason)
+    return g_reason
+
+
+def document_graph(g_base: Graph, g_reason: Graph | None = None, today_iso: str | None = None,
+                   include_scope_note: bool = True, reasoner: str = "owlrl") -> dict:
+    """
+    Run all pass-1 generators, writing AUTOGEN annotations into g_base.
+    Callers that already hold the parsed graph (or its reasoned copy from reasoned_copy())
+    can pass them in to skip re-parsing and re-reasoning across several passes;
+    otherwise g_base is reasoned over with `reasoner`.
+    Returns {"classes" | "data_props" | "object_props" | "class_axioms": (added, updated)}.
+    """
+    if g_reason is None:
+        g_reason = reasoned_copy(g_base, reasoner)
+    today = today_iso or date.today().isoformat()
+    with graph_indexes(g_reason):  # tables built for this call only, shared by the four generators
+        return {
+            "classes": add_class_definitions(g_reason, g_base, today),
+            "data_props": add_datatype_property_definitions(g_reason, g_base, today),
+            "object_props": add_object_property_definitions(g_reason, g_base, today),
+            "class_axioms": add_class_axiom_scope_notes(g_reason, g_base, today,
+                                                        include_scope_note=include_scope_note),
+        }
+
+
 # --------------------
 # Main
 # --------------------
@@ -749,10 +1063,27 @@ def main_cli():
     parser = argparse.ArgumentParser(
         description="Generate boilerplate SKOS definitions for classes and datatype properties."
     )
-    parser.add_argument("input", help="Path to the input Turtle ontology (e.g., People_Ontology.ttl)")
+    parser.add_argument(
+        "input",
+        help="Path to the input ontology (e.g., People_Ontology.ttl). Format is taken from the extension "
+             "(.ttl, .nt, .owl/.rdf, ...); N-Triples parses fastest for very large files."
+    )
     parser.add_argument(
         "-o", "--output",
-        help="Output TTL path. Defaults to <input>_with_documentation.ttl"
+        help="Output path. Defaults to <input>_with_documentation.ttl. Format follows the extension; "
+             "use .nt for a fast, unsorted N-Triples dump of large ontologies."
+    )
+    parser.add_argument(
+        "--format",
+        help="rdflib serializer for the output (e.g. turtle, nt, xml, hext), overriding the -o extension. "
+             "'nt' is linear and much faster than Turtle on large or blank-node-heavy graphs."
+    )
+    parser.add_argument(
+        "--fast-append",
+        action="store_true",
+        help="Copy the input file unchanged and append only the generated triples, instead of "
+             "re-serializing the whole graph. Turtle/N-Triples only; falls back to a full write "
+             "when the output format differs or existing AUTOGEN text was replaced."
     )
     parser.add_argument(
         "--on-exist",
@@ -765,6 +1096,14 @@ def main_cli():
         action="store_true",
         help="Do not generate skos:scopeNote technical sentences for class axioms."
     )
+    parser.add_argument(
+        "--reasoner",
+        choices=sorted(REASONERS),
+        default="owlrl",
+        help="Entailment applied before generating text. 'rdfs' is much faster but skips "
+             "equivalence and property-characteristic inferences; 'none' uses asserted triples only. "
+             "Default: owlrl"
+    )
 
     args = parser.parse_args()
 
@@ -775,29 +1114,25 @@ def main_cli():
 
     # Load base (to be serialized)
     g_base = Graph()
-    g_base.parse(in_path.as_posix(), format="turtle")
-
-    # Reason on a separate copy (read-only view)
-    g_reason = Graph()
-    g_reason += g_base
-    # Keep axiomatic/datatype entailments out to avoid clutter
-    DeductiveClosure(
-        OWLRL_Semantics,
-        axiomatic_triples=False,
-        datatype_axioms=False
-    ).expand(g_reason)
-
-    today = date.today().isoformat()
-
-    cls_added, cls_updated = add_class_definitions(g_reason, g_base, today)
-    dp_added, dp_updated = add_datatype_property_definitions(g_reason, g_base, today)
-    op_added, op_updated = add_object_property_definitions(g_reason, g_base, today)
-
-    cls_axiom_added, cls_axiom_updated = add_class_axiom_scope_notes(
-        g_reason, g_base, today, include_scope_note=(not args.no_scope_notes)
-    )
+    in_format = guess_format(in_path.as_posix()) or "turtle"
+    g_base.parse(in_path.as_posix(), format=in_format)
+    annotation_preds = (SKOS.definition, SKOS.scopeNote)
+    if args.fast_append:
+        before = {t for pred in annotation_preds for t in g_base.triples((None, pred, None))}
+
+    # Reason on a separate copy (read-only view) and write annotations into g_base
+    counts = document_graph(g_base, include_scope_note=(not args.no_scope_notes), reasoner=args.reasoner)
+    cls_added, cls_updated = counts["classes"]
+    dp_added, dp_updated = counts["data_props"]
+    op_added, op_updated = counts["object_props"]
+    cls_axiom_added, cls_axiom_updated = counts["class_axioms"]
 
     out_path = Path(args.output) if args.output else in_path.with_name(in_path.stem + "_with_documentation.ttl")
+    out_format = args.format or guess_format(out_path.as_posix()) or "turtle"
+    appendable = (in_format in ("turtle", "nt") and out_format == in_format
+                  and not any(updated for _, updated in counts.values()))
+    # Read the input before handling existing output: -o may name the input file itself
+    src = in_path.read_bytes() if args.fast_append and appendable else None
 
     # Handle existing output
     if out_path.exists():
@@ -815,7 +1150,23 @@ def main_cli():
                 sys.exit(4)
         # overwrite: do nothing special
 
-    g_base.serialize(destination=out_path.as_posix(), format="turtle")
+    if args.fast_append and not appendable:
+        print("--fast-append needs Turtle/N-Triples in and out in the same format, with no replaced "
+              "definitions; writing a full serialization instead.", file=sys.stderr)
+    if src is not None:
+        # Copy the input verbatim and append only the new triples as N-Triples lines (also valid Turtle)
+        g_new = Graph()
+        g_new.addN((s, p, o, g_new) for pred in annotation_preds
+                   for s, p, o in g_base.triples((None, pred, None)) if (s, p, o) not in before)
+        with open(out_path, "wb", buffering=1 << 20) as out:
+            out.write(src)
+            if src and not src.endswith(b"\n"):
+                out.write(b"\n")
+            g_new.serialize(destination=out, format="nt", encoding="utf-8")
+    else:
+        # Large write buffer: the serializers emit many small writes
+        with open(out_path, "wb", buffering=1 << 20) as out:
+            g_base.serialize(destination=out, format=out_format, encoding="utf-8")
 
     print(f"Classes:    added {cls_added}" + (f", updated {cls_updated}" if OVERWRITE_EXISTING_AUTOGEN else ""))
     print(f"Data props: added {dp_added}" + (f", updated {dp_updated}" if OVERWRITE_EXISTING_AUTOGEN else ""))
@@ -37,8 +37,14 @@ Notes
 """
 
 # pip install rdflib>=6
+from collections import defaultdict
+
 from rdflib import Graph, Namespace, URIRef, RDF, RDFS, OWL, Literal
 
+# rdf:types that mark a subject as a property rather than an individual
+PROPERTY_TYPES = frozenset({OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty, OWL.TransitiveProperty,
+                            OWL.SymmetricProperty, OWL.FunctionalProperty, OWL.InverseFunctionalProperty})
+
 def generate_labels(g: Graph, ontology_iri: str, lang: str | None = None):
     """
     Add rdfs:label for entities in a given ontology namespace that lack one.
@@ -72,16 +78,17 @@ def generate_labels(g: Graph, ontology_iri: str, lang: str | None = None):
     OWL_TOP_OBJ = OWL.topObjectProperty
     OWL_TOP_DATA = OWL.topDataProperty
 
-    # Helpers
-    def in_ns(u: URIRef) -> bool:
-        s = str(u)
-        return s.startswith(ns_prefix)
+    # Terms tested per triple (namespace attribute lookups build a new URIRef each time)
+    OWL_CLASS = OWL.Class
+    OWL_OBJ_PROP = OWL.ObjectProperty
+    OWL_DATA_PROP = OWL.DatatypeProperty
+    RDFS_LABEL = RDFS.label
 
-    def local_from_ns(u: URIRef) -> str:
-        s = str(u)
-        if not s.startswith(ns_prefix):
-            return ""
-        return s[len(ns_prefix):]
+    plen = len(ns_prefix)
+
+    # Helpers (URIRef is a str subclass, so no str() copy is needed)
+    def in_ns(u: URIRef) -> bool:
+        return u.startswith(ns_prefix)
 
     def make_label_from_local(local: str, for_property: bool) -> str:
         # SNAP pattern: replace underscores with spaces; properties lowercased, others unchanged
@@ -94,38 +101,42 @@ def generate_labels(g: Graph, ontology_iri: str, lang: str | None = None):
         # global check (any label at all)? Not used directly; we do per-lang logic below.
         return (u, RDFS.label, None) not in g
 
+    # Languages of the existing rdfs:label literals per subject (one pass over the labels)
+    label_langs = defaultdict(set)
+    for s, _, lit in g.triples((None, RDFS_LABEL, None)):
+        if isinstance(lit, Literal):
+            label_langs[s].add(lit.language)
+
     def already_has_label_for_lang(u: URIRef, lang_tag: str | None) -> bool:
-        for _, _, lit in g.triples((u, RDFS.label, None)):
-            if isinstance(lit, Literal):
-                if lang_tag is None and (lit.language is None):
-                    return True
-                if lang_tag is not None and lit.language == lang_tag:
-                    return True
-        return False
+        return lang_tag in label_langs.get(u, ())
+
+    new_quads = []  # added in one addN() call after the loop
 
     def add_label(u: URIRef, text: str):
         if not text:
             return False
         lit = Literal(text, lang=lang) if lang is not None else Literal(text)
-        g.add((u, RDFS.label, lit))
+        new_quads.append((u, RDFS_LABEL, lit, g))
+        # keep the index current: an entity can be both a class and an individual
+        label_langs[u].add(lang)
         return True
 
-    # Collect candidates by type
-    classes = set(s for s, _, t in g.triples((None, RDF.type, OWL.Class)) if in_ns(s))
-    obj_props = set(s for s, _, t in g.triples((None, RDF.type, OWL.ObjectProperty)) if in_ns(s))
-    data_props = set(s for s, _, t in g.triples((None, RDF.type, OWL.DatatypeProperty)) if in_ns(s))
-
+    # Collect candidates by type in a single rdf:type pass.
     # Individuals: anything in the namespace that has an rdf:type, but is not a Class or Property
     # (More general than SNAP's explicit `a owl:Thing`, and closer to common data.)
-    property_types = {OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty, OWL.TransitiveProperty,
-                      OWL.SymmetricProperty, OWL.FunctionalProperty, OWL.InverseFunctionalProperty}
-    individuals = set()
+    classes, obj_props, data_props, individuals = set(), set(), set(), set()
     for s, _, t in g.triples((None, RDF.type, None)):
-        if not isinstance(s, URIRef) or not in_ns(s):
+        if not in_ns(s):
             continue
-        if t == OWL.Class or t in property_types:
+        if t == OWL_CLASS:
+            classes.add(s)
             continue
-        individuals.add(s)
+        if t == OWL_OBJ_PROP:
+            obj_props.add(s)
+        elif t == OWL_DATA_PROP:
+            data_props.add(s)
+        if isinstance(s, URIRef) and t not in PROPERTY_TYPES:
+            individuals.add(s)
 
     report = {
         "created": 0,
@@ -134,72 +145,32 @@ def generate_labels(g: Graph, ontology_iri: str, lang: str | None = None):
         "examples_created": [],
     }
 
-    # Classes (skip OWL:Thing/Nothing explicitly)
-    for c in classes:
-        if c in (OWL_THING, OWL_NOTHING):
-            continue
-        local = local_from_ns(c)
-        if not local:
-            report["namespace_filtered"] += 1
-            continue
-        if already_has_label_for_lang(c, lang):
-            report["skipped_existing"] += 1
-            continue
-        lbl = make_label_from_local(local, for_property=False)
-        if add_label(c, lbl):
-            report["created"] += 1
-            if len(report["examples_created"]) < 5:
-                report["examples_created"].append((str(c), lbl))
-
-    # Object properties (skip topObjectProperty)
-    for p in obj_props:
-        if p == OWL_TOP_OBJ:
-            continue
-        local = local_from_ns(p)
-        if not local:
-            report["namespace_filtered"] += 1
-            continue
-        if already_has_label_for_lang(p, lang):
-            report["skipped_existing"] += 1
-            continue
-        lbl = make_label_from_local(local, for_property=True)
-        if add_label(p, lbl):
-            report["created"] += 1
-            if len(report["examples_created"]) < 5:
-                report["examples_created"].append((str(p), lbl))
-
-    # Data properties (skip topDataProperty)
-    for p in data_props:
-        if p == OWL_TOP_DATA:
-            continue
-        local = local_from_ns(p)
-        if not local:
-            report["namespace_filtered"] += 1
-            continue
-        if already_has_label_for_lang(p, lang):
-            report["skipped_existing"] += 1
-            continue
-        lbl = make_label_from_local(local, for_property=True)
-        if add_label(p, lbl):
-            report["created"] += 1
-            if len(report["examples_created"]) < 5:
-                report["examples_created"].append((str(p), lbl))
-
-    # Individuals
-    for i in individuals:
-        # No extra built-in filters needed here; we already filtered out classes & properties
-        local = local_from_ns(i)
-        if not local:
-            report["namespace_filtered"] += 1
-            continue
-        if already_has_label_for_lang(i, lang):
-            report["skipped_existing"] += 1
-            continue
-        lbl = make_label_from_local(local, for_property=False)
-        if add_label(i, lbl):
-            report["created"] += 1
-            if len(report["examples_created"]) < 5:
-                report["examples_created"].append((str(i), lbl))
+    # One table-driven pass: (candidates, lowercase label?, built-ins to skip).
+    # Order matters: an entity that is both a class and an individual is labelled as a class first.
+    work = (
+        (classes, False, (OWL_THING, OWL_NOTHING)),
+        (obj_props, True, (OWL_TOP_OBJ,)),
+        (data_props, True, (OWL_TOP_DATA,)),
+        (individuals, False, ()),  # classes & properties are already filtered out
+    )
+    examples = report["examples_created"]
+    for candidates, for_property, skip in work:
+        for u in candidates:
+            if u in skip:
+                continue
+            local = u[plen:]  # candidates are already namespace-filtered
+            if not local:
+                report["namespace_filtered"] += 1
+                continue
+            if already_has_label_for_lang(u, lang):
+                report["skipped_existing"] += 1
+                continue
+            lbl = make_label_from_local(local, for_property=for_property)
+            if add_label(u, lbl):
+                report["created"] += 1
+                if len(examples) < 5:
+                    examples.append((str(u), lbl))
+    g.addN(new_quads)
 
     return report
 
@@ -1,11 +1,14 @@
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from rdflib import Graph, URIRef, Namespace, BNode, Literal
 from rdflib.namespace import RDF, RDFS, OWL, XSD
 
 SH = Namespace("http://www.w3.org/ns/shacl#")
 
+# Ranges that get a shape when no datatype_properties are given
+DEFAULT_DATATYPES = frozenset({XSD.decimal, XSD.integer, XSD.dateTime})
+
 
 def _infer_sep_from_graph(g: Graph, base: str) -> str:
     """
@@ -15,10 +18,11 @@ def _infer_sep_from_graph(g: Graph, base: str) -> str:
     hash_count = 0
     slash_count = 0
     base_str = str(base)
+    offset = len(base_str)
     for s in set(g.subjects(RDF.type, OWL.DatatypeProperty)):
         s_str = str(s)
         if s_str.startswith(base_str):
-            if "#" in s_str[len(base_str):]:
+            if "#" in s_str[offset:]:
                 hash_count += 1
             else:
                 slash_count += 1
@@ -29,12 +33,13 @@ def _expand_one_identifier(
     g: Graph,
     ident: str,
     iri_base: Optional[str],
-    iri_sep: Optional[str]
+    iri_sep: Optional[str],
+    prefix_map: Optional[Dict[str, URIRef]] = None,
 ) -> URIRef:
     """
     Resolve `ident` which can be a full IRI, CURIE, or bare local name.
     - Full IRI: used as-is
-    - CURIE: expanded via graph prefixes
+    - CURIE: expanded via graph prefixes (or `prefix_map`, when resolving many identifiers)
     - Bare name: requires iri_base; uses iri_sep or infers it
     """
     # Full IRI?
@@ -44,7 +49,11 @@ def _expand_one_identifier(
     # CURIE?
     if ":" in ident:
         prefix, local = ident.split(":", 1)
-        ns = dict(g.namespace_manager.namespaces()).get(prefix)
+        if prefix_map is not None:
+            ns = prefix_map.get(prefix)
+        else:
+            # Direct prefix lookup; going through the manager makes sure default bindings exist
+            ns = g.namespace_manager.store.namespace(prefix)
         if ns:
             return URIRef(str(ns) + local)
         # Not a known prefix; treat as bare name fall-through
@@ -68,13 +77,12 @@ def _select_default_datatype_properties(g: Graph) -> List[Tuple[URIRef, URIRef]]
     Find all owl:DatatypeProperty with rdfs:range in {xsd:decimal, xsd:integer, xsd:dateTime}.
     Returns list of (property, expected_datatype).
     """
-    allowed = {XSD.decimal, XSD.integer, XSD.dateTime}
-    results = []
-    for p in g.subjects(RDF.type, OWL.DatatypeProperty):
-        for rng in g.objects(p, RDFS.range):
-            if isinstance(rng, URIRef) and rng in allowed:
-                results.append((p, rng))
-    return results
+    datatype_props = set(g.subjects(RDF.type, OWL.DatatypeProperty))
+    # One rdfs:range scan instead of a range lookup per property
+    return [
+        (p, rng) for p, rng in g.subject_objects(RDFS.range)
+        if rng in DEFAULT_DATATYPES and p in datatype_props
+    ]
 
 
 def _localname(u: Union[str, URIRef]) -> str:
@@ -96,6 +104,22 @@ def _add_prefixes(dst: Graph, src: Graph):
         dst.namespace_manager.bind(prefix, ns, replace=False)
 
 
+def _range_removal_update(g: Graph, props: List[URIRef]) -> str:
+    """SPARQL Update deleting the rdfs:range triples of `props`, i.e. what remove_ranges drops."""
+    rng_pred = RDFS.range.n3()
+    data, bnode_props = [], []
+    for prop in props:
+        for rng in g.objects(prop, RDFS.range):
+            if isinstance(rng, BNode):
+                bnode_props.append(prop)  # DELETE DATA cannot name a blank node; match it instead
+                break
+            data.append(f"  {prop.n3()} {rng_pred} {rng.n3()} .")
+    # An empty DELETE DATA still keeps the file a valid, no-op update
+    ops = ["DELETE DATA {\n" + "".join(line + "\n" for line in data) + "}"]
+    ops.extend(f"DELETE WHERE {{ {prop.n3()} {rng_pred} ?range . }}" for prop in bnode_props)
+    return "# rdfs:range triples removed by owl_to_shacl(remove_ranges=True)\n" + " ;\n".join(ops) + "\n"
+
+
 def owl_to_shacl(
     path: str,
     datatype_properties: Optional[List[str]] = None,
@@ -104,6 +128,8 @@ def owl_to_shacl(
     iri_base: Optional[str] = None,
     iri_sep: Optional[str] = None,
     strict_ident_check: bool = True,
+    serialize_format: str = "turtle",
+    write_refactored: bool = True,
 ) -> Tuple[Path, Optional[Path]]:
     """
     Generate SHACL constraints for datatype properties from an OWL ontology.
@@ -132,10 +158,18 @@ def owl_to_shacl(
     strict_ident_check : bool
         If True, error when a provided property cannot be found as owl:DatatypeProperty.
         If False, skip unknowns with a warning.
+    serialize_format : str
+        RDFLib serializer for both output files. Default "turtle". "nt" writes one
+        triple per line in linear time (still valid Turtle, so the .ttl names stay
+        correct) and avoids the Turtle writer's slowdown on large ontologies.
+    write_refactored : bool
+        Only used with remove_ranges. If True (default), write the full '*_refactored.ttl'.
+        If False, write a SPARQL Update ('*_remove_ranges.ru') that deletes those
+        rdfs:range triples, which skips re-serializing the whole ontology.
 
     Returns
     -------
-    (shacl_file_path, refactored_file_path_or_None)
+    (shacl_file_path, refactored_or_update_file_path_or_None)
     """
     # ---------- Load the ontology ----------
     src_path = Path(path)
@@ -149,9 +183,13 @@ def owl_to_shacl(
     targets: List[Tuple[URIRef, URIRef]] = []
 
     if datatype_properties:
-        # Resolve each identifier and look up its declared range
+        # Resolve each identifier and look up its declared range.
+        # Prefixes and the bare-name separator are the same for every identifier: work them out once.
+        prefix_map = dict(g.namespace_manager.namespaces())
+        if iri_base and not iri_sep:
+            iri_sep = _infer_sep_from_graph(g, iri_base)
         for ident in datatype_properties:
-            prop = _expand_one_identifier(g, ident, iri_base, iri_sep)
+            prop = _expand_one_identifier(g, ident, iri_base, iri_sep, prefix_map)
             # ensure it's declared (or at least used) as a datatype property
             is_dataprop = (prop, RDF.type, OWL.DatatypeProperty) in g
             if not is_dataprop:
@@ -189,24 +227,27 @@ def owl_to_shacl(
     # simple shapes graph node (optional)
     # shapes_graph_uri = URIRef(str(src_path.resolve().as_uri()) + "#Shapes")  # optional; not strictly needed
 
+    triples: List[Tuple] = []  # added in one addN() call after the loop
     for prop, expected_dt in targets:
         # NodeShape per property
         shape_uri = URIRef(str(prop) + "_Shape")
-        shapes_g.add((shape_uri, RDF.type, SH.NodeShape))
-        # Validate wherever the property appears
-        shapes_g.add((shape_uri, SH.targetSubjectsOf, prop))
-
-        # PropertyShape
         pshape = BNode()
-        shapes_g.add((shape_uri, SH.property, pshape))
-        shapes_g.add((pshape, SH.path, prop))
-        shapes_g.add((pshape, SH.datatype, expected_dt))
         # Provide a helpful message
         msg = f"Value of {str(prop)} must have datatype {str(expected_dt)}."
-        shapes_g.add((pshape, SH.message, Literal(msg)))
+        triples.extend((
+            (shape_uri, RDF.type, SH.NodeShape),
+            # Validate wherever the property appears
+            (shape_uri, SH.targetSubjectsOf, prop),
+            # PropertyShape
+            (shape_uri, SH.property, pshape),
+            (pshape, SH.path, prop),
+            (pshape, SH.datatype, expected_dt),
+            (pshape, SH.message, Literal(msg)),
+        ))
 
         # By default, SHACL violations are severity=Violation; can be made explicit:
-        # shapes_g.add((pshape, SH.severity, SH.Violation))
+        # triples.append((pshape, SH.severity, SH.Violation))
+    shapes_g.addN((s, p, o, shapes_g) for s, p, o in triples)
 
     # ---------- Write SHACL file ----------
     if shacl_path:
@@ -216,19 +257,20 @@ def owl_to_shacl(
     else:
         shacl_out = src_path.with_name(src_path.stem + "_constraints.shacl.ttl")
 
-    shapes_g.serialize(destination=shacl_out.as_posix(), format="turtle")
+    shapes_g.serialize(destination=shacl_out.as_posix(), format=serialize_format, encoding="utf-8")
 
     # ---------- Optionally remove ranges and write refactored ontology ----------
     refactored_out: Optional[Path] = None
-    if remove_ranges:
-        to_remove = []
-        for prop, expected_dt in targets:
-            for rng in g.objects(prop, RDFS.range):
-                to_remove.append((prop, RDFS.range, rng))
-        for triple in to_remove:
-            g.remove(triple)
+    if remove_ranges and write_refactored:
+        # Wildcard remove: one call per property instead of one per range triple
+        for prop, _ in targets:
+            g.remove((prop, RDFS.range, None))
 
         refactored_out = src_path.with_name(src_path.stem + "_refactored.ttl")
-        g.serialize(destination=refactored_out.as_posix(), format="turtle")
+        g.serialize(destination=refactored_out.as_posix(), format=serialize_format, encoding="utf-8")
+    elif remove_ranges:
+        # Deletions only: a SPARQL Update to apply to the source, instead of re-serializing the ontology
+        refactored_out = src_path.with_name(src_path.stem + "_remove_ranges.ru")
+        refactored_out.write_text(_range_removal_update(g, [prop for prop, _ in targets]), encoding="utf-8")
 
     return shacl_out, refactored_out
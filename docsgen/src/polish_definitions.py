@@ -5,25 +5,39 @@ Pass 2: Polish auto-generated class definitions in-place using ChatGPT.
 - Selects only skos:definition literals that contain the P1 token "⟦AUTOGEN:P1:YYYY-MM-DD⟧"
   (also supports legacy "Auto generated comment" suffix if no token is present).
 - Sends just the pre-token text to the model with strict copy-edit instructions.
+  Several definitions share one request (JSON in, JSON out), up to POLISH_BATCH_CHARS
+  characters of text per request (default 8000; 0 -> one definition per request).
 - Replaces the literal with the polished text + " ⟦AUTOGEN:P2:YYYY-MM-DD⟧".
 - Leaves human-authored definitions alone.
+- Requests run concurrently (at most POLISH_CONCURRENCY at a time, default 16), each with a
+  POLISH_TIMEOUT (default 60 s) and up to POLISH_MAX_RETRIES (default 5) backed-off retries.
+- Replies are cached on disk (POLISH_CACHE, default .polish_cache.sqlite; "" disables),
+  keyed by model + instructions + text, so reruns only send new or changed definitions.
 
 Usage:
   python polish_definitions.py People_Ontology_with_documentation.ttl
+  (any RDF syntax rdflib knows by extension; .nt parses fastest for very large files)
+  POLISH_FORMAT=nt python polish_definitions.py big_ontology.nt   # fast N-Triples output
 """
 
+import asyncio
+import hashlib
+import json
 import os
 import re
+import shutil
+import sqlite3
 import sys
 from pathlib import Path
 from datetime import date
 
 from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import SKOS
+from rdflib.util import guess_format
 
 try:
     # Official OpenAI SDK (pip install openai)
-    from openai import OpenAI
+    from openai import AsyncOpenAI
 except Exception as e:
     raise SystemExit("Missing dependency: pip install openai\n" + str(e))
 
@@ -32,16 +46,30 @@ except Exception as e:
 # --------------------
 MODEL_NAME = os.environ.get("OPENAI_MODEL", "gpt-5")  # change to "gpt-4o" if you don't have gpt-5
 USE_LANGUAGE_TAGS = False   # True -> add @en ; False -> untagged literal
-P1_TOKEN_RE = re.compile(r"\u27E6AUTOGEN:P1:(\d{4}-\d{2}-\d{2})\u27E7")  # ⟦AUTOGEN:P1:YYYY-MM-DD⟧
-P2_TOKEN_RE = re.compile(r"\u27E6AUTOGEN:P2:(\d{4}-\d{2}-\d{2})\u27E7")
+POLISH_CONCURRENCY = int(os.environ.get("POLISH_CONCURRENCY", "16"))  # max requests in flight
+# Per-request timeout (seconds) and retries; the SDK retries 429s, 5xx, timeouts and connection
+# errors with exponential backoff + jitter (honouring Retry-After) before we see an exception
+POLISH_TIMEOUT = float(os.environ.get("POLISH_TIMEOUT", "60"))
+POLISH_MAX_RETRIES = int(os.environ.get("POLISH_MAX_RETRIES", "5"))
+POLISH_BATCH_CHARS = int(os.environ.get("POLISH_BATCH_CHARS", "8000"))  # text packed into one request
+# RDFLib serializer for the output; "nt" writes in linear time and is still valid Turtle, so the
+# *_polished.ttl name stays correct (the Turtle writer slows down badly on large graphs)
+OUTPUT_FORMAT = os.environ.get("POLISH_FORMAT", "turtle")
+CACHE_PATH = os.environ.get("POLISH_CACHE", ".polish_cache.sqlite")  # "" -> no response cache
+CACHE_COMMIT_EVERY = 20  # commit cached replies in batches rather than per insert
+AUTOGEN_TOKEN_RE = re.compile(r"\u27E6AUTOGEN:(P[12]):(\d{4}-\d{2}-\d{2})\u27E7")  # ⟦AUTOGEN:P1|P2:YYYY-MM-DD⟧
 LEGACY_MARKER_RE = re.compile(r"Auto generated comment\s+\d{4}-\d{2}-\d{2}\s*$", re.IGNORECASE)
 
-INSTRUCTIONS = (
+COPYEDIT_RULES = (
     "You are a meticulous technical copyeditor for ontology documentation. "
     "Polish the following sentence(s) for grammar and readability only. "
     "Do NOT add, remove, or change any facts, entities, or their relationships. "
     "Keep the sentence order. Keep all technical terms exactly as written. "
-    "Return ONLY the edited text, without quotes or extra commentary."
+)
+INSTRUCTIONS = COPYEDIT_RULES + "Return ONLY the edited text, without quotes or extra commentary."
+BATCH_INSTRUCTIONS = COPYEDIT_RULES + (
+    'The input is a JSON array of {"id": ..., "text": ...} objects; polish each text on its own. '
+    'Return ONLY a JSON object {"items": [{"id": ..., "polished": ...}, ...]} with one item per input id.'
 )
 
 # --------------------
@@ -85,18 +113,20 @@ def minimal_named_parents(g: Graph, cls: URIRef) -> list[URIRef]:
 
 def split_autogen_text(raw: str):
     """Return (core_text, token) if this is an autogen-P1 string; otherwise (None, None)."""
-    # Already P2? Skip
-    if P2_TOKEN_RE.search(raw):
-        return None, None
-
-    m = P1_TOKEN_RE.search(raw)
-    if m:
-        core = raw[: m.start()].rstrip()
-        token = m.group(0)
-        return core, token
+    # Plain substring tests gate the regexes: most definitions carry no marker at all
+    if "\u27E6AUTOGEN:P" in raw:
+        tokens = list(AUTOGEN_TOKEN_RE.finditer(raw))
+        # Already P2? Skip
+        if any(m.group(1) == "P2" for m in tokens):
+            return None, None
+        if tokens:
+            m = tokens[0]
+            core = raw[: m.start()].rstrip()
+            token = m.group(0)
+            return core, token
 
     # Legacy support
-    if LEGACY_MARKER_RE.search(raw):
+    if "auto generated comment" in raw.lower() and LEGACY_MARKER_RE.search(raw):
         core = LEGACY_MARKER_RE.sub("", raw).rstrip()
         today = date.today().isoformat()
         token = f"⟦AUTOGEN:P1:{today}⟧"
@@ -104,69 +134,179 @@ def split_autogen_text(raw: str):
 
     return None, None
 
-def polish_text(client: OpenAI, text: str) -> str:
+async def polish_text(client: AsyncOpenAI, text: str) -> str:
     """Call OpenAI Responses API to copy-edit `text`. Returns polished text."""
-    resp = client.responses.create(
+    resp = await client.responses.create(
         model=MODEL_NAME,
         instructions=INSTRUCTIONS,
         input=text,
     )
     return resp.output_text.strip()
 
+async def polish_batch(client: AsyncOpenAI, texts: list[str]) -> list[str | None]:
+    """Copy-edit several texts in one Responses call. None marks a text missing or malformed in the reply."""
+    payload = [{"id": n, "text": t} for n, t in enumerate(texts)]
+    resp = await client.responses.create(
+        model=MODEL_NAME,
+        instructions=BATCH_INSTRUCTIONS,
+        input=json.dumps(payload, ensure_ascii=False),
+        text={"format": {"type": "json_object"}},
+    )
+    try:
+        items = json.loads(resp.output_text)["items"]
+    except (ValueError, KeyError, TypeError):
+        return [None] * len(texts)
+    polished = {}
+    for item in items if isinstance(items, list) else ():
+        try:
+            n, text = int(item["id"]), item["polished"]
+        except (KeyError, TypeError, ValueError):
+            continue  # a malformed item only loses its own text
+        if isinstance(text, str):
+            polished.setdefault(n, text.strip())
+    return [polished.get(n) for n in range(len(texts))]
+
+def chunk_by_chars(texts: list[str], limit: int) -> list[list[int]]:
+    """Group text indexes, in order, so each group's combined length stays within limit (an oversize text goes alone)."""
+    groups, cur, size = [], [], 0
+    for n, t in enumerate(texts):
+        if cur and (limit <= 0 or size + len(t) > limit):
+            groups.append(cur)
+            cur, size = [], 0
+        cur.append(n)
+        size += len(t)
+    if cur:
+        groups.append(cur)
+    return groups
+
+def open_cache(path: str) -> sqlite3.Connection:
+    """Open (or create) the exact-match response cache."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+def _cache_key(text: str) -> str:
+    # Replies from polish_text and polish_batch share one entry per text, so the key covers both
+    # prompts: any change to the model, INSTRUCTIONS or BATCH_INSTRUCTIONS invalidates earlier replies
+    prompts = f"{MODEL_NAME}\0{INSTRUCTIONS}\0{BATCH_INSTRUCTIONS}"
+    return hashlib.sha256(f"{prompts}\0{text}".encode("utf-8")).hexdigest()
+
+def cache_get(conn: sqlite3.Connection, text: str) -> str | None:
+    row = conn.execute("SELECT value FROM kv WHERE key = ?", (_cache_key(text),)).fetchone()
+    return row[0] if row else None
+
+def cache_put(conn: sqlite3.Connection, text: str, polished: str):
+    conn.execute("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", (_cache_key(text), polished))
+    if conn.total_changes % CACHE_COMMIT_EVERY == 0:
+        conn.commit()
+
 # --------------------
 # Main
 # --------------------
-def main(in_path: str):
+async def main(in_path: str):
     in_path = Path(in_path)
     if not in_path.exists():
         raise SystemExit(f"Input file not found: {in_path}")
 
-    client = OpenAI()  # reads OPENAI_API_KEY from environment
+    # reads OPENAI_API_KEY from environment
+    client = AsyncOpenAI(timeout=POLISH_TIMEOUT, max_retries=POLISH_MAX_RETRIES)
 
     g = Graph()
-    g.parse(in_path.as_posix(), format="turtle")
+    # Parser from the extension: N-Triples (.nt) input uses rdflib's fast line parser
+    in_format = guess_format(in_path.as_posix()) or "turtle"
+    g.parse(in_path.as_posix(), format=in_format)
     print(f"[INFO] Loaded graph with {len(g)} triples from {in_path}")
 
-    # Collect all definitions
-    targets = [(cls, lit) for cls, _, lit in g.triples((None, SKOS.definition, None)) if isinstance(lit, Literal)]
-    print(f"[INFO] Found {len(targets)} definitions. Scanning for AUTOGEN markers...")
-
+    # Stream the definitions and keep only the AUTOGEN-P1 ones (no list of every definition)
     updated = 0
-    total_targets = len(targets)
+    total_targets = 0
 
-    for i, (cls, lit) in enumerate(targets, 1):
+    jobs = []
+    for cls, lit in g.subject_objects(SKOS.definition):
+        if not isinstance(lit, Literal):
+            continue
+        total_targets += 1
         core, token = split_autogen_text(str(lit))
         if core is None:
             continue  # not our target
+        jobs.append((total_targets, cls, lit, core))
+    print(f"[INFO] Found {total_targets} definitions, {len(jobs)} with AUTOGEN-P1 markers.")
 
-        print(f"[{i}/{total_targets}] Polishing definition for {cls}")
+    # Answer what we can from the cache; only misses go to the API
+    cache = open_cache(CACHE_PATH) if CACHE_PATH else None
+    results = [cache_get(cache, core) if cache else None for _, _, _, core in jobs]
+    misses = [n for n, polished in enumerate(results) if polished is None]
+    if cache:
+        print(f"[INFO] {len(jobs) - len(misses)} of {len(jobs)} AUTOGEN definitions found in {CACHE_PATH}")
 
-        # Copy-edit the core text via LLM
-        try:
-            polished = polish_text(client, core)
-            print(f"    → Done (preview): {polished[:60]}...")
-        except Exception as e:
-            print(f"[WARN] Skipping one definition due to API error: {e}")
+    sem = asyncio.Semaphore(POLISH_CONCURRENCY)
+
+    async def bounded_polish(batch: list[int]):
+        cores = [jobs[n][3] for n in batch]
+        async with sem:
+            for n in batch:
+                print(f"[{jobs[n][0]}/{total_targets}] Polishing definition for {jobs[n][1]}")
+            # Copy-edit the core texts via LLM
+            polished = [None] * len(batch)
+            if len(batch) > 1:
+                try:
+                    polished = await polish_batch(client, cores)
+                except Exception as e:
+                    print(f"[WARN] Batched request for {len(batch)} definition(s) failed ({e}); retrying one at a time")
+            # Texts the batched reply did not cover go through polish_text one at a time
+            for k, text in enumerate(polished):
+                if text is None:
+                    try:
+                        polished[k] = await polish_text(client, cores[k])
+                    except Exception as e:
+                        print(f"[WARN] Skipping {jobs[batch[k]][1]} due to API error: {e}")
+        for n, core, text in zip(batch, cores, polished):
+            if text is None:
+                continue
+            results[n] = text
+            if cache:
+                cache_put(cache, core, text)
+            print(f"    → Done (preview): {text[:60]}...")
+
+    batches = [[misses[k] for k in group]
+               for group in chunk_by_chars([jobs[n][3] for n in misses], POLISH_BATCH_CHARS)]
+    try:
+        await asyncio.gather(*(bounded_polish(batch) for batch in batches))
+    finally:
+        if cache:
+            cache.commit()
+            cache.close()
+
+    # Apply the edits once all requests are back (the graph is only touched here, in input order)
+    definition = SKOS.definition
+    p2 = f"⟦AUTOGEN:P2:{date.today().isoformat()}⟧"  # one date for the whole run
+    lang = "en" if USE_LANGUAGE_TAGS else None
+    new_quads = []  # added in one addN() call after the old literals are removed
+    for (i, cls, lit, _), polished in zip(jobs, results):
+        if polished is None:
             continue
 
         # Replace with polished + P2 token
-        p2 = f"⟦AUTOGEN:P2:{date.today().isoformat()}⟧"
         new_text = f"{polished} {p2}"
 
-        lang = "en" if USE_LANGUAGE_TAGS else None
-
-        g.remove((cls, SKOS.definition, lit))
-        g.add((cls, SKOS.definition, Literal(new_text, lang=lang)))
+        g.remove((cls, definition, lit))
+        new_quads.append((cls, definition, Literal(new_text, lang=lang), g))
         updated += 1
 
         if i % 10 == 0:
             print(f"[INFO] Processed {i} definitions so far...")
+    g.addN(new_quads)
 
     # Output file name: add "_polished" before extension
     stem = in_path.stem
     out_name = f"{stem}_polished.ttl"
     out_path = in_path.with_name(out_name)
-    g.serialize(destination=out_path.as_posix(), format="turtle")
+    if updated == 0 and in_format == OUTPUT_FORMAT:
+        # Nothing changed and the input is already in the output format: a byte copy beats re-serializing
+        print("[INFO] No AUTOGEN-P1 definitions were polished; copying the input unchanged.")
+        shutil.copyfile(in_path, out_path)
+    else:
+        g.serialize(destination=out_path.as_posix(), format=OUTPUT_FORMAT, encoding="utf-8")
 
     print(f"[INFO] Polished {updated} auto-generated definition(s).")
     print(f"[INFO] Wrote: {out_path}")
@@ -176,4 +316,4 @@ if __name__ == "__main__":
         print("Usage: python polish_definitions.py path/to/ontology.ttl", file=sys.stderr)
         sys.exit(2)
     path = sys.argv[1] if len(sys.argv) == 2 else "ontology_with_documentation.ttl"
-    main(path)
+    asyncio.run(main(path))
@@ -1,5 +1,11 @@
+import hashlib
+import re
+from uuid import uuid4
+
 from rdflib import Graph, Namespace, URIRef, RDF, RDFS, OWL
 
+_UNSAFE_CHARS_RE = re.compile(r'[^A-Za-z0-9_]+')
+
 def relation_transformation(
     g: Graph,
     *,
@@ -20,85 +26,84 @@ def relation_transformation(
 
     PersonLike = base_ns[person_superclass_local] if person_superclass_local else C
 
-    def _ensure_decl(iri: URIRef, rdf_type: URIRef):
-        if (iri, RDF.type, rdf_type) not in g and not dry_run:
-            g.add((iri, RDF.type, rdf_type))
+    # Graph.add() of a triple that is already present is a no-op and g.remove() of a missing
+    # one does nothing, so no "(s, p, o) in g" probes are needed before either.
+    # New triples are collected as quads and added with addN(); removals happen in place.
+    adds = []
 
     # --- SCHEMA updates ---
-    _ensure_decl(N, OWL.Class)
-    _ensure_decl(L, OWL.ObjectProperty)
-    _ensure_decl(I, OWL.ObjectProperty)  # NEW
-
-    # Domain/range for link L: PersonLike -> N
     if not dry_run:
-        if (L, RDFS.domain, PersonLike) not in g: g.add((L, RDFS.domain, PersonLike))
-        if (L, RDFS.range,  N)          not in g: g.add((L, RDFS.range,  N))
-        # NEW: inverse property schema N -> PersonLike + inverseOf axioms (both directions for robustness)
-        if (I, RDFS.domain, N)          not in g: g.add((I, RDFS.domain, N))
-        if (I, RDFS.range,  PersonLike) not in g: g.add((I, RDFS.range,  PersonLike))
-        if (L, OWL.inverseOf, I)        not in g: g.add((L, OWL.inverseOf, I))
-        if (I, OWL.inverseOf, L)        not in g: g.add((I, OWL.inverseOf, L))
+        g.addN((s, p, o, g) for s, p, o in (
+            (N, RDF.type, OWL.Class),
+            (L, RDF.type, OWL.ObjectProperty),
+            (I, RDF.type, OWL.ObjectProperty),  # NEW
+            # Domain/range for link L: PersonLike -> N
+            (L, RDFS.domain, PersonLike),
+            (L, RDFS.range,  N),
+            # NEW: inverse property schema N -> PersonLike + inverseOf axioms (both directions for robustness)
+            (I, RDFS.domain, N),
+            (I, RDFS.range,  PersonLike),
+            (L, OWL.inverseOf, I),
+            (I, OWL.inverseOf, L),
+        ))
 
-    # Flip domains of properties with domain C -> N (includes R if explicitly C)
-    props_with_domain_C = [p for p, _, d in g.triples((None, RDFS.domain, None)) if d == C]
-    if (R, RDFS.domain, C) in g and R not in props_with_domain_C:
-        props_with_domain_C.append(R)
-    for p in props_with_domain_C:
-        if (p, RDFS.domain, C) in g and not dry_run:
+    # Flip domains of properties with domain C -> N (includes R if explicitly C).
+    # Runs after the schema is in the graph: with PersonLike == C, L's new domain is flipped too.
+    props_with_domain_C = list(g.subjects(RDFS.domain, C))
+    if not dry_run:
+        for p in props_with_domain_C:
             g.remove((p, RDFS.domain, C))
-            g.add((p, RDFS.domain, N))
+            adds.append((p, RDFS.domain, N, g))
 
     # --- DATA migration (unchanged) ---
-    from uuid import uuid4
     def _local_name(iri_like) -> str:
+        # text after the last '#', '/' or ':'
         s = str(iri_like)
-        for sep in ['#','/',':']:
-            if sep in s: s = s.rsplit(sep,1)[-1]
-        return s
+        return s[max(s.rfind('#'), s.rfind('/'), s.rfind(':')) + 1:]
     def _safe_local(s: str) -> str:
-        import re
-        s = re.sub(r'[^A-Za-z0-9_]+','_', s)
+        s = _UNSAFE_CHARS_RE.sub('_', s)
         return s or str(uuid4()).replace('-', '_')
     def _mint_N_instance(x: URIRef, key: str) -> URIRef:
         local = f"{new_class_name}_{_local_name(x)}_{_safe_local(_local_name(key))}"
         return base_ns[local]
 
-    move_props = set(props_with_domain_C)
-    move_props.discard(L)
+    move_props = frozenset(props_with_domain_C) - {L, R}
 
-    instances = {s for s, _, _ in g.triples((None, RDF.type, C))}
+    instances = set(g.subjects(RDF.type, C))
 
     for x in instances:
-        employers = {o for _, _, o in g.triples((x, R, None))}
-        other_asserts = [(p, v) for p in move_props for _, _, v in g.triples((x, p, None)) if p != R]
+        employers = set(g.objects(x, R))
+        # One pass over x's own triples instead of a lookup per movable property
+        other_asserts = [(p, v) for p, v in g.predicate_objects(x) if p in move_props]
 
         if employers:
             for o in employers:
                 n_inst = _mint_N_instance(x, key=str(o))
                 if not dry_run:
-                    g.add((n_inst, RDF.type, N))
+                    adds.append((n_inst, RDF.type, N, g))
                     # Forward and inverse links
-                    g.add((x, L, n_inst))
-                    g.add((n_inst, I, x))
-                    # Move R
-                    if (x, R, o) in g:
-                        g.remove((x, R, o))
-                        g.add((n_inst, R, o))
+                    adds.append((x, L, n_inst, g))
+                    adds.append((n_inst, I, x, g))
+                    # Move R (o came from x's own R triples)
+                    g.remove((x, R, o))
+                    adds.append((n_inst, R, o, g))
                     # Copy other props to N-node, then erase on x
-                    for p, v in other_asserts:
-                        g.add((n_inst, p, v))
+                    adds.extend((n_inst, p, v, g) for p, v in other_asserts)
             if not dry_run:
                 for p, v in other_asserts:
-                    if (x, p, v) in g: g.remove((x, p, v))
+                    g.remove((x, p, v))
         else:
             if other_asserts:
-                n_inst = _mint_N_instance(x, key=str(uuid4()))
+                # Content-addressed key: the same IRI on every run (no RNG, reproducible diffs)
+                key = hashlib.blake2b(f"{x} {R}".encode("utf-8"), digest_size=6).hexdigest()
+                n_inst = _mint_N_instance(x, key=key)
                 if not dry_run:
-                    g.add((n_inst, RDF.type, N))
-                    g.add((x, L, n_inst))
-                    g.add((n_inst, I, x))  # inverse link
+                    adds.append((n_inst, RDF.type, N, g))
+                    adds.append((x, L, n_inst, g))
+                    adds.append((n_inst, I, x, g))  # inverse link
                     for p, v in other_asserts:
-                        g.add((n_inst, p, v))
-                        if (x, p, v) in g: g.remove((x, p, v))
+                        adds.append((n_inst, p, v, g))
+                        g.remove((x, p, v))
 
+    g.addN(adds)
     return (C, R, N)
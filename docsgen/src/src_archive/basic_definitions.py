@@ -1,4 +1,4 @@
-from rdflib import Graph, RDF, RDFS, OWL, Namespace, Literal
+from rdflib import Graph, RDFS, OWL
 from rdflib.namespace import SKOS
 
 # Example ontology snippet
@@ -16,15 +16,17 @@ ttl = """
 # Load into RDFLib graph
 g = Graph().parse(data=ttl, format="turtle")
 
-# Iterate over classes
-for cls in g.subjects(RDF.type, OWL.Class):
-    label = g.value(cls, RDFS.label)
-    superclass = g.value(cls, RDFS.subClassOf)
-    superclass_label = g.value(superclass, RDFS.label) if superclass else None
-
-    if label and superclass_label:
-        definition = f"Every {label} is a kind of {superclass_label}."
-        g.add((cls, SKOS.definition, Literal(definition)))
+# Generate all definitions in one SPARQL update (one per labelled class/superclass pair)
+g.update("""
+    INSERT { ?cls skos:definition ?definition }
+    WHERE {
+        ?cls a owl:Class ;
+             rdfs:label ?label ;
+             rdfs:subClassOf ?superclass .
+        ?superclass rdfs:label ?superclass_label .
+        BIND(CONCAT("Every ", STR(?label), " is a kind of ", STR(?superclass_label), ".") AS ?definition)
+    }
+""", initNs={"owl": OWL, "rdfs": RDFS, "skos": SKOS})
 
 # Print out the results
 for cls, definition in g.subject_objects(SKOS.definition):
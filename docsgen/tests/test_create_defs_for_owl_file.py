@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+from rdflib import Graph, Literal, Namespace, RDFS, SKOS
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from create_defs_for_owl_file import document_graph, graph_indexes, label_for, reasoned_copy  # noqa: E402
+
+PEOPLE = Namespace("http://michaeldebellis.com/people/")
+
+
+def test_minimal_reasoner_derives_parents_of_intersection_classes():
+    g = Graph().parse(SRC / "People_Ontology.ttl")
+    g_reason = reasoned_copy(g, "minimal")
+    for cls in ("Adult", "Man", "Woman", "Parent", "Hermit", "Social_Person", "Einsteins_Wife"):
+        assert (PEOPLE[cls], RDFS.subClassOf, PEOPLE.Agent) in g_reason, cls
+
+    document_graph(g, g_reason, today_iso="2025-01-01")
+    empty = {s for s, o in g.subject_objects(SKOS.definition) if str(o).startswith("⟦AUTOGEN")}
+    assert empty == {PEOPLE.Agent, PEOPLE.Gender, PEOPLE.Living_Thing, PEOPLE.Place}
+
+
+def test_label_for_keeps_first_label_inside_graph_indexes():
+    g = Graph()
+    a, b = PEOPLE.A, PEOPLE.B
+    g.add((b, RDFS.label, Literal("Zed", lang="de")))
+    g.add((a, RDFS.label, Literal("Alpha", lang="en")))
+    g.add((a, RDFS.label, Literal("Zed", lang="de")))
+    assert label_for(g, a) == "Alpha"
+    with graph_indexes(g):
+        assert label_for(g, a) == "Alpha"